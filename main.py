@@ -59,15 +59,21 @@ column lines.
 
 """
 
-from typing import NamedTuple, Optional, NoReturn, Iterable
+from typing import NamedTuple, Optional, NoReturn, Union
 
 import random
 import math
 import logging
 
+import numpy as np
 import pygame
 
-from ui_classes import InputBox, InfoText, ColorType
+try:
+    import numba
+except ImportError:
+    numba = None
+
+from ui_classes import InputBox, InfoText
 
 column_space = 100
 column_count = 8
@@ -112,6 +118,10 @@ pi_counter = InfoText(5, font.get_height() * 3, font, display_font_color)
 drops_input = InputBox(5, font.get_height() * 4.1, 175, 30, empty_text='Enter drop count: ')
 
 window_width = column_count * column_space + sidebar_width  # Get window window_width
+# Column line's x values:
+columns_x_values = np.arange(0, column_count + 1, dtype=np.float32) * column_space
+_column_line_endpoints = tuple(((sidebar_width + x, 0), (sidebar_width + x, window_height))
+                               for x in columns_x_values.tolist())  # Column lines on screen
 
 # Correct needle length, if needed:
 if needle_length > column_space:
@@ -122,15 +132,18 @@ if needle_length > column_space:
 
 Cords = NamedTuple('Cords', (('x', float), ('y', float)))
 
+_rng = np.random.default_rng()
+
 
 class TheoreticalNeedle:
     """A Numerical representation of a needle of length `length` with its
     center at a random location on a board `board_width` by `board_height`.
 
     """
+    __slots__ = ('column_space', 'center', 'angle', 'point1', 'point2', 'hit')
 
-    def __init__(self, board_width: int, board_height: int, length: int, columns: Iterable[int]):
-        self.column_values = columns
+    def __init__(self, board_width: int, board_height: int, length: int, column_space: int):
+        self.column_space = column_space
 
         self.center = Cords(random.uniform(0, board_width),
                             random.uniform(0, board_height))
@@ -145,15 +158,20 @@ class TheoreticalNeedle:
                 self.center.x - (length / 2 * math.cos(self.angle)),
                 self.center.y - (length / 2 * math.sin(self.angle)))
 
-    @property
-    def hit(self) -> Optional[Cords]:
-        """If needle is a hit (crosses an x value in `columns`) returns the hit location."""
-        for column_value in self.column_values:
-            if (self.point1.x <= column_value <= self.point2.x) or (
-                    self.point1.x >= column_value >= self.point2.x):
-                break
-        else:
+        self.hit = self._compute_hit()  # Hit location, or `None` if needle is a miss
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(point1={self.point1}, point2={self.point2})"
+
+    def _compute_hit(self) -> Optional[Cords]:
+        """If needle is a hit (crosses a column line) returns the hit location."""
+        # Columns are evenly spaced, so a needle crosses one if and only if
+        # its end points lie in different columns:
+        column1 = int(self.point1.x // self.column_space)
+        column2 = int(self.point2.x // self.column_space)
+        if column1 == column2:
             return None
+        column_value = max(column1, column2) * self.column_space
 
         # Find intercept point of needle and column:
         slope = (self.point2.y - self.point1.y) / (self.point2.x - self.point1.x)
@@ -163,60 +181,233 @@ class TheoreticalNeedle:
         return Cords(column_value, y)
 
 
-class Needle(TheoreticalNeedle):
-    """A UI representation of a needle.
+def _simulate_batch(n: int, board_width: int, board_height: int, length: int,
+                    column_space: int) -> tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray,
+                                                np.ndarray]:
+    """Drop `n` needles and return the hit count, the needles' end points
+    (`p1x`, `p1y`, `p2x`, `p2y`) and the hit mask.
 
     Note
     ----
-    Only arguments only relating to UI display have defaults provided.
+    This is the NumPy implementation, used when Numba isn't installed.
 
     """
-    needles = []  # List of all instances.
+    # Draw all random values with a single call, then scale each column:
+    center_x, center_y, angle = _rng.random((3, n), dtype=np.float32)
+    center_x *= board_width
+    center_y *= board_height
+    angle *= 2 * math.pi
 
-    def __init__(self, surface: pygame.Surface,
-                 board_width: int, board_height: int, board_x_offset: int,
-                 length: int, column_values: Iterable[int],
-                 thickness: int = needle_thickness,
-                 hit_color: ColorType = needle_hit_color,
-                 miss_color: ColorType = needle_miss_color,
-                 hit_location_color: ColorType = needle_hit_location_color,
-                 hit_location_size: int = needle_hit_location_size):
+    dx = length / 2 * np.cos(angle)
+    dy = length / 2 * np.sin(angle)
+    p1x = center_x + dx
+    p1y = center_y + dy
+    p2x = center_x - dx
+    p2y = center_y - dy
 
-        super().__init__(board_width, board_height, length, column_values)
+    # A needle is a hit if its end points lie in different columns:
+    hit_mask = (p1x // column_space).astype(np.int32) != (p2x // column_space).astype(np.int32)
 
-        self.surface = surface
-        self.board_x_offset = board_x_offset
-        self.thickness = thickness
-        self.hit_location_color = hit_location_color
-        self.hit_location_size = hit_location_size
+    return int(hit_mask.sum()), p1x, p1y, p2x, p2y, hit_mask
 
-        self.color = hit_color if self.hit else miss_color
-        self.needles.append(self)
 
-    def __repr__(self) -> str:
-        return f"{self.__class__.__name__}('__dict__': {self.__dict__})"
-
-    def draw(self, mark_hit: bool) -> None:
-        """Draw needle on `surface`."""
-        pygame.draw.line(self.surface,
-                         self.color,
-                         (self.point1.x + sidebar_width, self.point1.y),
-                         (self.point2.x + sidebar_width, self.point2.y),
-                         self.thickness)
-        if self.hit and mark_hit:
-            pygame.draw.circle(self.surface, self.hit_location_color,
-                               (self.hit.x + self.board_x_offset, self.hit.y),
-                               self.hit_location_size)
+def _simulate_batch_jit(n: int, board_width: int, board_height: int, length: int,
+                        column_space: int) -> tuple[int, np.ndarray, np.ndarray, np.ndarray,
+                                                    np.ndarray, np.ndarray]:
+    """Numba kernel equivalent to `_simulate_batch`, written as a loop so it
+    compiles to native code and runs across all cores.
+
+    """
+    p1x = np.empty(n, dtype=np.float32)
+    p1y = np.empty(n, dtype=np.float32)
+    p2x = np.empty(n, dtype=np.float32)
+    p2y = np.empty(n, dtype=np.float32)
+    hit_mask = np.empty(n, dtype=np.bool_)
+    hits = 0
+
+    for i in numba.prange(n):
+        center_x = np.random.uniform(0, board_width)
+        center_y = np.random.uniform(0, board_height)
+        angle = np.random.uniform(0, 2 * math.pi)
+
+        dx = length / 2 * math.cos(angle)
+        dy = length / 2 * math.sin(angle)
+        p1x[i] = center_x + dx
+        p1y[i] = center_y + dy
+        p2x[i] = center_x - dx
+        p2y[i] = center_y - dy
+
+        hit_mask[i] = int(p1x[i] // column_space) != int(p2x[i] // column_space)
+        if hit_mask[i]:
+            hits += 1
+
+    return hits, p1x, p1y, p2x, p2y, hit_mask
+
+
+if numba is not None:
+    simulate_batch = numba.njit(parallel=True, fastmath=True, cache=True)(_simulate_batch_jit)
+else:
+    logging.warning('Numba is not installed, falling back to NumPy needle simulation.')
+    simulate_batch = _simulate_batch
+
+
+class Needle:
+    """A UI representation of all dropped needles.
+
+    Needle geometry is stored as class-level arrays (one element per needle)
+    rather than as a list of objects, so whole batches of needles can be
+    dropped and tested for hits at once. The arrays are a ring buffer of
+    length `draw_limit`: once full, new needles overwrite the oldest ones.
+
+    Attributes
+    ----------
+    _p1x, _p1y, _p2x, _p2y : numpy.ndarray
+        End point coordinates of the most recent needles.
+    _is_hit : numpy.ndarray
+        `1` where a needle crosses a column, `0` otherwise.
+    _hit_x, _hit_y : numpy.ndarray
+        Hit location of each needle. Only meaningful where `_is_hit` is set.
+    _write : int
+        Index the next needle will be written to.
+    _count : int
+        Number of needles currently stored, at most `draw_limit`.
+    _dropped : int
+        Total number of needles dropped since the last `clear`.
+    _static_layer : pygame.Surface
+        Board-sized surface the stored needles are rendered onto as they are
+        dropped, so each frame only needs to blit it.
+
+    """
+    thickness = needle_thickness
+    hit_color = needle_hit_color
+    miss_color = needle_miss_color
+    hit_location_color = needle_hit_location_color
+    hit_location_size = needle_hit_location_size
+    mark_hits_limit = mark_hit_locations_limit
+
+    _p1x = np.empty(draw_limit, dtype=np.float32)
+    _p1y = np.empty(draw_limit, dtype=np.float32)
+    _p2x = np.empty(draw_limit, dtype=np.float32)
+    _p2y = np.empty(draw_limit, dtype=np.float32)
+    _is_hit = np.empty(draw_limit, dtype=np.uint8)
+    _hit_x = np.empty(draw_limit, dtype=np.float32)
+    _hit_y = np.empty(draw_limit, dtype=np.float32)
+    _write = 0
+    _count = 0
+    _dropped = 0
+
+    _static_layer = pygame.Surface((column_count * column_space, window_height))
+    _static_layer.fill(background_color)
+    _static_layer.set_colorkey(background_color)  # Let the column lines show through
+
+    @classmethod
+    def drop_batch(cls, n: int, board_width: int, board_height: int, length: int,
+                   column_space: int) -> int:
+        """Drop `n` needles on the board, draw them onto `_static_layer` and
+        return how many of them are hits.
+
+        """
+        hits, p1x, p1y, p2x, p2y, hit_mask = simulate_batch(n, board_width, board_height,
+                                                            length, column_space)
+
+        # Find intercept point of needles and columns:
+        hit_x = np.maximum(p1x // column_space, p2x // column_space) * column_space
+        hit_y = np.zeros(n, dtype=np.float32)
+        slope = (p2y[hit_mask] - p1y[hit_mask]) / (p2x[hit_mask] - p1x[hit_mask])
+        hit_y[hit_mask] = p1y[hit_mask] + slope * (hit_x[hit_mask] - p1x[hit_mask])
+
+        # Only the last `draw_limit` needles of the batch can be kept:
+        kept = slice(max(n - draw_limit, 0), n)
+        indices = (cls._write + np.arange(kept.start, n)) % draw_limit
+        cls._p1x[indices] = p1x[kept]
+        cls._p1y[indices] = p1y[kept]
+        cls._p2x[indices] = p2x[kept]
+        cls._p2y[indices] = p2y[kept]
+        cls._is_hit[indices] = hit_mask[kept]
+        cls._hit_x[indices] = hit_x[kept]
+        cls._hit_y[indices] = hit_y[kept]
+
+        marked_hits = cls._marking_hits()
+        evicted = cls._count + n > draw_limit
+
+        cls._write = (cls._write + n) % draw_limit
+        cls._count = min(cls._count + n, draw_limit)
+        cls._dropped += n
+
+        # Needles can't be erased from the layer, so redraw it if any were
+        # overwritten or hit locations need to be hidden:
+        if evicted or marked_hits != cls._marking_hits():
+            cls._redraw()
+        else:
+            cls._draw(indices)
+
+        return hits
+
+    @classmethod
+    def clear(cls) -> None:
+        """Erase all dropped needles in place. The ring buffer arrays and
+        `_static_layer` are reused; only the indices are reset.
+
+        """
+        cls._write = 0
+        cls._count = 0
+        cls._dropped = 0
+        cls._static_layer.fill(background_color)
+
+    @classmethod
+    def _marking_hits(cls) -> bool:
+        """Whether hit locations are drawn. See `mark_hit_locations_limit`."""
+        return cls.mark_hits_limit is None or cls._dropped <= cls.mark_hits_limit
+
+    @classmethod
+    def _redraw(cls) -> None:
+        """Clear `_static_layer` and draw all stored needles on it, oldest first."""
+        cls._static_layer.fill(background_color)
+        if cls._count < draw_limit:
+            # The ring hasn't wrapped yet, so needles are stored in order from 0:
+            cls._draw(slice(0, cls._count))
+        else:
+            cls._draw(slice(cls._write, draw_limit))
+            cls._draw(slice(0, cls._write))
 
     @classmethod
-    def draw_all(cls, limit: Optional[int] = None, mark_hits_limit: Optional[int] = None) -> None:
-        """Draw all objects in `needles` up to `limit`. See `draw_limit`."""
-        first_drawn_index = len(cls.needles) - limit
-        mark_hits = True if mark_hits_limit is None or len(
-                cls.needles) <= mark_hits_limit else False
-        for i, needle in enumerate(cls.needles):
-            if not limit or i >= first_drawn_index:
-                needle.draw(mark_hits)
+    def _draw(cls, indices: Union[np.ndarray, slice]) -> None:
+        """Draw the needles stored at `indices` on `_static_layer`."""
+        for p1x, p1y, p2x, p2y, hit in zip(
+                cls._p1x[indices].tolist(), cls._p1y[indices].tolist(),
+                cls._p2x[indices].tolist(), cls._p2y[indices].tolist(),
+                cls._is_hit[indices].tolist()):
+            pygame.draw.line(cls._static_layer,
+                             cls.hit_color if hit else cls.miss_color,
+                             (p1x, p1y), (p2x, p2y),
+                             cls.thickness)
+
+        if cls._marking_hits():
+            cls._mark_hits(indices)
+
+    @classmethod
+    def _mark_hits(cls, indices: Union[np.ndarray, slice]) -> None:
+        """Paint the hit location dots of the needles stored at `indices` on
+        `_static_layer`, writing all of their pixels at once.
+
+        """
+        hits = cls._is_hit[indices].astype(bool)
+        hit_x = np.rint(cls._hit_x[indices][hits]).astype(np.int32)
+        hit_y = np.rint(cls._hit_y[indices][hits]).astype(np.int32)
+
+        # Pixel offsets making up a dot of radius `hit_location_size`:
+        radius = cls.hit_location_size
+        dot_x, dot_y = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+        in_dot = dot_x ** 2 + dot_y ** 2 <= radius ** 2
+
+        x = (hit_x[:, None] + dot_x[in_dot]).ravel()
+        y = (hit_y[:, None] + dot_y[in_dot]).ravel()
+        width, height = cls._static_layer.get_size()
+        on_layer = (0 <= x) & (x < width) & (0 <= y) & (y < height)
+
+        pixels = pygame.surfarray.pixels3d(cls._static_layer)
+        pixels[x[on_layer], y[on_layer]] = tuple(cls.hit_location_color)[:3]
+        del pixels  # Unlock `_static_layer`
 
 
 def get_rates(drops_left: int) -> tuple[int, int]:
@@ -225,59 +416,76 @@ def get_rates(drops_left: int) -> tuple[int, int]:
     needle drops.
 
     """
+    if drops_left <= 0:
+        return 0, default_target_fps
+
     # Set drops per frame:
-    if drops_left == 0:
-        drops_per_frame = 0
-    elif drops_left <= 100:
-        drops_per_frame = 1
-    else:
-        drops_per_frame = int(drops_left / 10)
+    drops_per_frame = 1 if drops_left <= 100 else drops_left // 10
 
-    # Set target fps:
-    try:
-        target_fps = int(default_target_fps ** (0.75 * drops_left - 100 / drops_left) + 9)
-    except OverflowError:
-        target_fps = 0
-        logging.debug('`target_fps` is too large, removing fps limit.')
-    except ZeroDivisionError:
+    # Set target fps, only large batches (dropped over about ten frames) run uncapped:
+    if drops_left < 1000:
         target_fps = default_target_fps
+    else:
+        target_fps = 0
+        logging.debug('Removing fps limit.')
 
-    if drops_per_frame:
-        logging.debug(
-                f'Set `drops_per_frame` to {drops_per_frame} and `target_fps` to {target_fps}.')
+    logging.debug(f'Set `drops_per_frame` to {drops_per_frame} and `target_fps` to {target_fps}.')
 
     return drops_per_frame, target_fps
 
 
 def draw_columns(surface: pygame.Surface) -> None:
     """Draw lines for all columns."""
-    for column_x in range(0, column_count + 1):
-        x = sidebar_width + column_x * column_space
-        pygame.draw.line(surface, column_line_color, (x, 0), (x, window_height),
-                         column_line_thickness)
+    for start, end in _column_line_endpoints:
+        pygame.draw.line(surface, column_line_color, start, end, column_line_thickness)
 
 
-def draw_screen(surface: pygame.Surface, drops: int, hits: int, fps: float, pi: float) -> None:
-    """All steps to draw screen."""
-    surface.fill(background_color)
+def build_background() -> pygame.Surface:
+    """Return a window-sized surface with the static parts of the screen
+    (background, column lines and sidebar) drawn on it.
 
-    Needle.draw_all(draw_limit, mark_hit_locations_limit)
+    """
+    background = pygame.Surface((window_width, window_height))
+    background.fill(background_color)
 
-    draw_columns(surface)
+    draw_columns(background)
 
-    pygame.draw.rect(surface, sidebar_color,
+    pygame.draw.rect(background, sidebar_color,
                      (0, 0, sidebar_width - 2, window_height))  # Draw sidebar
 
+    return background
+
+
+_background = build_background()
+
+
+def update_counters(drops: int, hits: int) -> None:
+    """Recalculate pi and update the drops, hits and pi counters' text."""
+    pi = (2 * drops * needle_length) / (hits * column_space) if hits else 0
+
+    drops_counter.text = f'Drops: {drops}'
+    hits_counter.text = f'Hits: {hits}'
+    pi_counter.text = f'Pi: {pi:.5f}'
+
+
+def draw_screen(surface: pygame.Surface, fps: float) -> None:
+    """All steps to draw screen."""
+    surface.blit(_background, (0, 0))
+
+    surface.blit(Needle._static_layer, (sidebar_width, 0))
+
     fps_counter.draw(surface, f'FPS: {fps:.1f}')
-    drops_counter.draw(surface, f'Drops: {drops}')
-    hits_counter.draw(surface, f'Hits: {hits}')
-    pi_counter.draw(surface, f'Pi: {pi:.5f}')
+    drops_counter.draw(surface)
+    hits_counter.draw(surface)
+    pi_counter.draw(surface)
     drops_input.draw(surface)
 
 
 def main() -> NoReturn:
     hits = 0
     drops = 0
+    prev_hits = None
+    prev_drops = None
     fps = 0
     target_drops = 0
     drops_left = 0
@@ -285,13 +493,16 @@ def main() -> NoReturn:
     drops_per_frame = 0
     reset_rates = True
 
-    columns_x_values = tuple(
-            column_space * n for n in range(0, column_count + 1))  # Column line's x values
-
     # Pygame setup
     pygame.init()
     screen = pygame.display.set_mode((window_width, window_height))
     pygame.display.set_caption("Buffon's Needle")
+    # Only queue events that are handled, so mouse motion etc. never reaches Python.
+    # TEXTINPUT must stay allowed: pygame fills in `KEYDOWN.unicode` from it, which
+    # `InputBox` relies on for keypad digits and non-QWERTY layouts.
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed((pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT,
+                              pygame.MOUSEBUTTONDOWN))
     logging.debug('Pygame setup complete.')
     clock = pygame.time.Clock()
 
@@ -313,7 +524,7 @@ def main() -> NoReturn:
                         logging.debug(f'Setting `target_drops` to `drops`. ({drops})')
                 # Reset if delete is pressed:
                 if event.key == pygame.K_DELETE:
-                    Needle.needles = []
+                    Needle.clear()
                     hits = 0
                     drops = 0
                     target_drops = 0
@@ -336,21 +547,20 @@ def main() -> NoReturn:
         reset_rates = False if drops_left else True  # Change if reset is allowed for next frame.
 
         # Add new needles:
-        if drops_left:
+        if drops_left > 0:
             # Drop remaining needles.
             drops_per_frame = drops_left if drops_left < drops_per_frame else drops_per_frame
-            for _ in range(drops_per_frame):
-                new_needle = Needle(screen, column_count * column_space, window_height,
-                                    sidebar_width,
-                                    needle_length, columns_x_values)
-                drops += 1
-                hits += 1 if new_needle.hit else 0
+            hits += Needle.drop_batch(drops_per_frame, column_count * column_space,
+                                      window_height, needle_length, column_space)
+            drops += drops_per_frame
 
-        pi = (2 * drops * needle_length) / (hits * column_space) if hits else 0
+        # Only update counters when needles have been dropped or erased:
+        if drops != prev_drops or hits != prev_hits:
+            update_counters(drops, hits)
+            prev_drops, prev_hits = drops, hits
 
-        draw_screen(screen, drops, hits, fps, pi)
+        draw_screen(screen, fps)
         pygame.display.flip()
-        pygame.display.update()
 
         clock.tick(target_fps)
         fps = clock.get_fps()
@@ -18,16 +18,18 @@ class InfoText:
 		self.color = color
 		self.text = text
 
-	@property
-	def surface(self) -> pygame.Surface:
-		"""Returns the text surface."""
-		return self.font.render(self.text, True, self.color)
+		self._cached_text = None
+		self._cached_surface = None
 
 	def draw(self, surface: pygame.Surface, text: Optional[str] = None) -> None:
 		"""Draws the display text. Specify `text` to update."""
 		if text is not None:
 			self.text = text
-		surface.blit(self.surface, (self.x, self.y))
+		# Only re-render the text surface when the text has changed:
+		if self.text != self._cached_text:
+			self._cached_surface = self.font.render(self.text, True, self.color)
+			self._cached_text = self.text
+		surface.blit(self._cached_surface, (self.x, self.y))
 
 
 class InputBox:
@@ -56,13 +58,19 @@ class InputBox:
 		self.active = False
 		self.text = ''
 
+		self._cached_key = None
+		self._cached_surface = None
+
 	@property
 	def text_surface(self) -> pygame.Surface:
-		"""Returns the text box surface."""
+		"""Returns the text box surface, only re-rendered when the text or color changes."""
 		display_text = self.text
 		if display_text == '':
 			display_text = self.empty_text
-		return self.font.render(display_text, self.antialias, self.color)
+		if (display_text, self.color) != self._cached_key:
+			self._cached_surface = self.font.render(display_text, self.antialias, self.color)
+			self._cached_key = (display_text, self.color)
+		return self._cached_surface
 
 	def handle_event(self, event: pygame.event.Event) -> Optional[str]:
 		"""Handles pygame events if applicable to the text box."""